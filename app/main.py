@@ -1,3 +1,4 @@
+import io
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 import sys
@@ -21,6 +22,46 @@ st.set_page_config(
 )
 
 
+@st.cache_data(show_spinner=False)
+def _cached_extract_invoices(
+    contents: List[bytes], names: List[str], use_llm: bool, model_name: str
+) -> List[Dict[str, Any]]:
+    """Extraction keyed on file bytes so widget-only reruns skip the re-parse."""
+    files = []
+    for data, name in zip(contents, names):
+        buf = io.BytesIO(data)
+        buf.name = name
+        files.append(buf)
+    return extract_invoices_from_pdfs(files, use_llm=use_llm, llm_model=model_name)
+
+
+_INVOICE_COLUMNS = [
+    "filename",
+    "invoice_number",
+    "invoice_date",
+    "total_amount",
+    "currency",
+]
+
+
+@st.cache_data(show_spinner=False)
+def _invoices_dataframe(invoices: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Display DataFrame with fixed columns/dtypes, rebuilt only when the
+    extraction results change rather than on every rerun."""
+    df = pd.DataFrame.from_records(invoices, columns=_INVOICE_COLUMNS)
+    # coerce: the LLM overlay may leave non-numeric strings in total_amount
+    df["total_amount"] = pd.to_numeric(df["total_amount"], errors="coerce")
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _cached_load_bank(file_bytes: bytes, name: str) -> pd.DataFrame:
+    """Statement parsing keyed on file bytes, same rationale as above."""
+    buf = io.BytesIO(file_bytes)
+    buf.name = name
+    return load_bank_statement(buf)
+
+
 def _load_local_css():
     css_path = Path(__file__).parent / "assets" / "styles.css"
     if css_path.exists():
@@ -96,8 +137,11 @@ def _handle_extraction(
             st.warning("Veuillez charger au moins une facture PDF.")
             return None
         with st.spinner("Extraction en cours..."):
-            extracted_invoices = extract_invoices_from_pdfs(
-                pdf_files, use_llm=use_llm, llm_model=model_name
+            extracted_invoices = _cached_extract_invoices(
+                [f.getvalue() for f in pdf_files],
+                [f.name for f in pdf_files],
+                use_llm,
+                model_name,
             )
         st.success(f"Extraction terminée: {len(extracted_invoices)} facture(s).")
         return extracted_invoices
@@ -113,7 +157,7 @@ def _handle_bank_statement_loading(
             st.warning("Veuillez charger un relevé bancaire.")
             return None
         with st.spinner("Lecture du relevé..."):
-            bank_df = load_bank_statement(bank_file)
+            bank_df = _cached_load_bank(bank_file.getvalue(), bank_file.name)
         st.success(
             f"Relevé chargé: {len(bank_df) if bank_df is not None else 0} opérations."
         )
@@ -125,9 +169,7 @@ def _display_results(amount_tol: float, date_tolerance_days: int):
     """Displays the extracted invoices and matching results."""
     if st.session_state.get("extracted_invoices"):
         st.subheader("Factures extraites")
-        df_inv = pd.DataFrame(st.session_state["extracted_invoices"]).drop(
-            columns=["raw_text"], errors="ignore"
-        )
+        df_inv = _invoices_dataframe(st.session_state["extracted_invoices"])
         st.dataframe(df_inv, use_container_width=True)
 
         xml_str = invoices_to_xml_string(st.session_state["extracted_invoices"])
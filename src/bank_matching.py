@@ -1,15 +1,69 @@
 from __future__ import annotations
 
+import csv
 import io
+import os
 import re
 import unicodedata
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import pdfplumber
 from dateutil import parser as dateparser
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+try:  # Optional fast PDF text backend (C++ PDFium); pdfplumber remains the fallback
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:  # Optional multi-threaded CSV reader; pandas remains the fallback
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
+_NONALNUM_RE = re.compile(r"[^a-z0-9]+")
+_WS_RE = re.compile(r"\s+")
+
+# Known header spellings, keyed by their _std_header normalization. Exact
+# O(1) lookups here replace the fuzzy header scan in the common case.
+_HEADER_SYNONYMS = {
+    "date": "date",
+    "date operation": "date",
+    "operation date": "date",
+    "transaction date": "date",
+    "booking date": "date",
+    "date valeur": "date",
+    "valeur": "date",
+    "description": "description",
+    "libelle": "description",
+    "label": "description",
+    "narration": "description",
+    "detail": "description",
+    "details": "description",
+    "montant": "amount",
+    "amount": "amount",
+    # Solde is the running balance: only usable as a last-resort amount,
+    # after debit/credit, so it gets its own role
+    "solde": "balance",
+    "debit credit": "amount",
+    "debit": "debit",
+    "retrait": "debit",
+    "credit": "credit",
+    "versement": "credit",
+}
+# Text-line fallback for PDF statements: one multiline pass captures
+# date, description and trailing amount per transaction line. The tail
+# tolerates \r because the PDFium backend emits \r\n line endings.
+_TXN_LINE_RE = re.compile(
+    r"^[ \t]*(\d{1,2}[\-/]\d{1,2}[\-/]\d{2,4})\s+(.*?)"
+    r"\s+([+-]?\s*\d[\d \.,]*?)[ \t\r]*$",
+    re.MULTILINE,
+)
 
 
 def _read_statement_to_dataframe(file) -> pd.DataFrame:
@@ -20,11 +74,22 @@ def _read_statement_to_dataframe(file) -> pd.DataFrame:
     if name.lower().endswith((".xlsx", ".xls")):
         return pd.read_excel(file)
 
-    # For CSV, try common separators
     content = file.read()
+
+    # For CSV, sniff the delimiter from a sample and parse once
+    try:
+        sample = content[:8192].decode("utf-8", errors="replace")
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        df = _parse_csv_bytes(content, dialect.delimiter)
+        if df.shape[1] > 1:
+            return df
+    except Exception:
+        pass
+
+    # Fallback: try common separators
     for sep in [",", ";", "\t", "|"]:
         try:
-            df = pd.read_csv(io.BytesIO(content), sep=sep)
+            df = _parse_csv_bytes(content, sep)
             if df.shape[1] > 1:
                 return df
         except Exception:
@@ -32,6 +97,16 @@ def _read_statement_to_dataframe(file) -> pd.DataFrame:
     raise ValueError("Impossible de lire le fichier CSV. Vérifiez le séparateur.")
 
 
+def _parse_csv_bytes(content: bytes, sep: str) -> pd.DataFrame:
+    """Parses CSV bytes, using pyarrow's parallel reader when installed."""
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            io.BytesIO(content), parse_options=pacsv.ParseOptions(delimiter=sep)
+        )
+        return table.to_pandas()
+    return pd.read_csv(io.BytesIO(content), sep=sep)
+
+
 def _strip_accents(s: str) -> str:
     return "".join(
         ch for ch in unicodedata.normalize("NFD", s or "") if unicodedata.category(ch) != "Mn"
@@ -40,8 +115,26 @@ def _strip_accents(s: str) -> str:
 
 def _std_header(s: str) -> str:
     s = _strip_accents(str(s)).lower().strip()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
+    s = _NONALNUM_RE.sub(" ", s)
+    return _WS_RE.sub(" ", s).strip()
+
+
+def _substring_header_index(std: List[str], cands) -> Optional[int]:
+    """Substring fallback for headers not in the synonym table."""
+    for i, h in enumerate(std):
+        if any(c in h for c in cands):
+            return i
+    return None
+
+
+# Role → substring candidates, tried in order when the synonym lookup misses
+_HEADER_FALLBACKS = {
+    "date": ("date",),
+    "description": ("description", "libelle", "label", "narration", "details"),
+    "amount": ("montant", "amount", "solde"),
+    "debit": ("debit", "retrait"),
+    "credit": ("credit", "versement"),
+}
 
 
 def _find_table_column_map(headers: List[str]) -> Optional[Dict[str, int]]:
@@ -52,17 +145,22 @@ def _find_table_column_map(headers: List[str]) -> Optional[Dict[str, int]]:
     """
     std = [_std_header(h) for h in headers]
 
-    def find(*cands) -> Optional[int]:
-        for i, h in enumerate(std):
-            if any(c in h for c in cands):
-                return i
-        return None
+    # Exact synonym lookup first; first matching header wins per role
+    roles: Dict[str, int] = {}
+    for i, h in enumerate(std):
+        role = _HEADER_SYNONYMS.get(h)
+        if role is not None and role not in roles:
+            roles[role] = i
 
-    c_date = find("date")
-    c_desc = find("description", "libelle", "label", "narration", "details")
-    c_amount = find("montant", "amount", "solde")
-    c_debit = find("debit", "retrait")
-    c_credit = find("credit", "versement")
+    for role, cands in _HEADER_FALLBACKS.items():
+        if roles.get(role) is None:
+            roles[role] = _substring_header_index(std, cands)
+
+    c_date = roles["date"]
+    c_desc = roles["description"]
+    c_amount = roles["amount"]
+    c_debit = roles["debit"]
+    c_credit = roles["credit"]
 
     if c_date is None or c_desc is None:
         return None
@@ -136,73 +234,100 @@ def _build_df_from_table(table: List[List[str]]) -> Optional[pd.DataFrame]:
     return out
 
 
+def _parse_text_lines(text: str) -> Optional[pd.DataFrame]:
+    """Parses "date description amount" transaction lines from page text."""
+    from .utils import parse_date as _parse_date, parse_amount as _parse_amount
+
+    recs = []
+    # One C-level sweep over the page buffer instead of a Python loop per line
+    for d_s, desc, amt_s in _TXN_LINE_RE.findall(text):
+        dt = _parse_date(d_s)
+        amt = _parse_amount(amt_s)
+        if dt and amt is not None:
+            recs.append({
+                "date": dt,
+                "description": desc,
+                "amount": amt,
+            })
+    return pd.DataFrame(recs) if recs else None
+
+
+def _extract_page_texts(content: bytes) -> List[str]:
+    """Extracts raw page texts, preferring the PDFium backend when installed."""
+    if pdfium is not None:
+        # PDFium takes raw bytes directly; no BytesIO buffering layer needed
+        doc = pdfium.PdfDocument(content)
+        try:
+            return [page.get_textpage().get_text_range() for page in doc]
+        finally:
+            doc.close()
+
+    texts = []
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        for page in pdf.pages:
+            try:
+                texts.append(page.extract_text(x_tolerance=2, y_tolerance=2) or "")
+            except Exception:
+                texts.append("")
+    return texts
+
+
+# Below this page count the process-pool startup costs more than it saves
+_MIN_PAGES_FOR_POOL = 4
+
+
+def _extract_page_tables(content: bytes, page_number: int) -> List[List[List[str]]]:
+    """Extracts raw tables from a single page; the process-pool work unit."""
+    try:
+        with pdfplumber.open(io.BytesIO(content), pages=[page_number]) as pdf:
+            return pdf.pages[0].extract_tables() or []
+    except Exception:
+        return []
+
+
 def _read_bank_pdf_to_dataframe(file) -> pd.DataFrame:
     """Extracts transactions from a PDF bank statement.
 
     Strategy:
-    - Try to extract tables and map header columns.
+    - Try to extract tables and map header columns (pages in parallel on
+      long statements — pdfplumber parsing is CPU-bound and per-page
+      independent).
     - Fallback to text line parsing if no usable tables.
     """
     content = file.read()
-    frames: List[pd.DataFrame] = []
     with pdfplumber.open(io.BytesIO(content)) as pdf:
-        for page in pdf.pages:
-            # Try tables first
-            try:
-                tables = page.extract_tables() or []
-            except Exception:
-                tables = []
-            for t in tables:
-                df = _build_df_from_table(t)
-                if df is not None and not df.empty:
-                    frames.append(df)
+        n_pages = len(pdf.pages)
+
+    page_numbers = range(1, n_pages + 1)
+    if n_pages >= _MIN_PAGES_FOR_POOL:
+        workers = min(os.cpu_count() or 1, n_pages)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            tables_per_page = list(
+                ex.map(_extract_page_tables, repeat(content), page_numbers)
+            )
+    else:
+        tables_per_page = [_extract_page_tables(content, n) for n in page_numbers]
 
-            # Fallback: text lines
-            try:
-                text = page.extract_text(x_tolerance=2, y_tolerance=2) or ""
-            except Exception:
-                text = ""
-            if text:
-                lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-                recs = []
-                date_re = re.compile(r"^(\d{1,2}[\-/]\d{1,2}[\-/]\d{2,4})\s+(.*)")
-                amt_re = re.compile(r"([+-]?\s*\d[\d\s\.,]*)$")
-                from .utils import parse_date as _parse_date, parse_amount as _parse_amount
-
-                for ln in lines:
-                    m = date_re.match(ln)
-                    if not m:
-                        continue
-                    d_s, rest = m.groups()
-                    amt_m = amt_re.search(rest)
-                    if not amt_m:
-                        continue
-                    amt_s = amt_m.group(1)
-                    desc = rest[: amt_m.start(1)].strip()
-                    dt = _parse_date(d_s)
-                    amt = _parse_amount(amt_s)
-                    if dt and amt is not None:
-                        recs.append({
-                            "date": dt,
-                            "description": desc,
-                            "amount": amt,
-                        })
-                if recs:
-                    frames.append(pd.DataFrame(recs))
+    frames: List[pd.DataFrame] = []
+    for tables in tables_per_page:
+        for t in tables:
+            df = _build_df_from_table(t)
+            if df is not None and not df.empty:
+                frames.append(df)
+
+    # Fallback: text lines (PDFium when available, pdfplumber otherwise)
+    if not frames:
+        for text in _extract_page_texts(content):
+            df = _parse_text_lines(text)
+            if df is not None:
+                frames.append(df)
 
     if not frames:
         raise ValueError("Aucune transaction détectée dans le PDF du relevé.")
 
     df = pd.concat(frames, ignore_index=True)
-    # Normalize date and amount columns
-    def _norm_date(v):
-        if isinstance(v, datetime):
-            return v
-        try:
-            return dateparser.parse(str(v), dayfirst=True, fuzzy=True)
-        except Exception:
-            return None
 
+    # Normalize date and amount columns
     def _norm_amount(v):
         if isinstance(v, (int, float)):
             return float(v)
@@ -211,7 +336,9 @@ def _read_bank_pdf_to_dataframe(file) -> pd.DataFrame:
         return _parse_amount(str(v))
 
     out = pd.DataFrame()
-    out["date"] = df["date"].apply(_norm_date)
+    out["date"] = pd.to_datetime(
+        df["date"], dayfirst=True, errors="coerce", format="mixed"
+    )
     out["description"] = df["description"].astype(str)
     out["amount"] = df["amount"].apply(_norm_amount)
     return out.dropna(subset=["date", "amount"]).reset_index(drop=True)
@@ -221,11 +348,18 @@ def _find_statement_columns(df: pd.DataFrame) -> Dict[str, str]:
     """Tries to automatically detect the columns for date, description, and amount."""
     cols = {c.lower().strip(): c for c in df.columns}
 
+    # Exact synonym lookup first; first matching column wins per role
+    roles: Dict[str, str] = {}
+    for c in df.columns:
+        role = _HEADER_SYNONYMS.get(_std_header(c))
+        if role is not None and role not in roles:
+            roles[role] = c
+
     def pick(*cands):
+        # Fuzzy fallback for columns not in the synonym table
         for c in cands:
             if c in cols:
                 return cols[c]
-        # fuzzy pick
         best = None
         best_score = 0
         for c in cols:
@@ -236,7 +370,7 @@ def _find_statement_columns(df: pd.DataFrame) -> Dict[str, str]:
                     best = c
         return cols.get(best) if best else None
 
-    c_date = pick(
+    c_date = roles.get("date") or pick(
         "date",
         "operation date",
         "transaction date",
@@ -244,10 +378,18 @@ def _find_statement_columns(df: pd.DataFrame) -> Dict[str, str]:
         "valeur",
         "date operation",
     )
-    c_desc = pick(
+    c_desc = roles.get("description") or pick(
         "description", "label", "libellé", "libelle", "narration", "detail", "details"
     )
-    c_amount = pick("amount", "montant", "debit/credit", "debit", "credit")
+    # Synonym priority, not column position: a true amount column beats
+    # debit/credit, and the Solde running balance is only a last resort
+    c_amount = (
+        roles.get("amount")
+        or roles.get("debit")
+        or roles.get("credit")
+        or roles.get("balance")
+        or pick("amount", "montant", "debit/credit", "debit", "credit")
+    )
 
     if not c_date or not c_desc or not c_amount:
         raise ValueError(
@@ -267,28 +409,25 @@ def _normalize_statement_dataframe(
     out["description"] = df[column_map["description"]].astype(str)
     out["amount_raw"] = df[column_map["amount"]]
 
-    def parse_date(s: str) -> Optional[datetime]:
-        try:
-            return dateparser.parse(s, dayfirst=True, fuzzy=True)
-        except Exception:
-            return None
-
-    out["date"] = out["date_raw"].apply(parse_date)
-
-    def parse_amount(v) -> Optional[float]:
-        if pd.isna(v):
-            return None
-        if isinstance(v, (int, float)):
-            return float(v)
-        s = str(v).replace("\u202f", " ").replace("\xa0", " ").strip()
-        s = s.replace(" ", "")
-        s = s.replace(",", ".")
-        try:
-            return float(s)
-        except Exception:
-            return None
+    # Vectorized conversion dispatches to C instead of calling dateutil per row
+    out["date"] = pd.to_datetime(
+        out["date_raw"], dayfirst=True, errors="coerce", format="mixed"
+    )
 
-    out["amount"] = out["amount_raw"].apply(parse_amount)
+    # Vectorized amount cleanup: strip spacing characters, use "." as the
+    # decimal separator, then let pd.to_numeric coerce in one pass.
+    if pd.api.types.is_numeric_dtype(out["amount_raw"]):
+        out["amount"] = out["amount_raw"].astype(float)
+    else:
+        s = (
+            out["amount_raw"]
+            .astype(str)
+            .str.replace("\u202f", "", regex=False)
+            .str.replace("\xa0", "", regex=False)
+            .str.replace(" ", "", regex=False)
+            .str.replace(",", ".", regex=False)
+        )
+        out["amount"] = pd.to_numeric(s, errors="coerce")
     return out.dropna(subset=["date", "amount"]).reset_index(drop=True)
 
 
@@ -298,51 +437,119 @@ def load_bank_statement(file) -> pd.DataFrame:
     """
     df = _read_statement_to_dataframe(file)
     column_map = _find_statement_columns(df)
-    return _normalize_statement_dataframe(df, column_map)
-
+    out = _normalize_statement_dataframe(df, column_map)
+    # Repeated labels ("VIREMENT SEPA", ...) are stored once as categories;
+    # the matcher can then case-fold per unique label instead of per row
+    out["description"] = out["description"].astype("category")
+    return out
 
-def _check_amount_match(
-    invoice_total: Optional[float],
-    transaction_amount: Optional[float],
-    tolerance: float,
-) -> bool:
-    """Checks if the invoice and transaction amounts match within a tolerance."""
-    if invoice_total is None or transaction_amount is None:
-        return False
-    return abs(abs(transaction_amount) - abs(invoice_total)) <= tolerance
 
+def _prepare_bank_columns(bank_df: pd.DataFrame) -> Dict[str, Any]:
+    """Extracts the bank columns used by the matcher as NumPy arrays.
 
-def _check_date_match(
-    invoice_date: Optional[datetime.date],
-    transaction_date: Optional[datetime.date],
-    max_days_delta: int,
-) -> bool:
-    """Checks if the transaction date is valid relative to the invoice date."""
-    if invoice_date is None or transaction_date is None:
-        return True  # Don't penalize if dates are missing
-    # Payment should be on or after the invoice date, within the allowed window
-    return (
-        transaction_date >= invoice_date
-        and (transaction_date - invoice_date).days <= max_days_delta
-    )
+    Candidate filtering runs as vectorized masks over these arrays instead of
+    iterating DataFrame rows, so they are computed once per statement. Rows
+    are sorted by date so each invoice's date window can be sliced in
+    O(log N) with searchsorted.
+    """
+    bank_df = bank_df.sort_values("date", kind="mergesort").reset_index(drop=True)
+    amounts = bank_df["amount"].to_numpy(dtype=np.float64)
+    desc = bank_df["description"]
+    if isinstance(desc.dtype, pd.CategoricalDtype):
+        # Case-fold once per unique label, then fan out through the codes
+        cats = np.array([str(c) for c in desc.cat.categories], dtype=object)
+        cats_lower = np.array([c.lower() for c in cats], dtype=object)
+        codes = desc.cat.codes.to_numpy()
+        descriptions = cats[codes]
+        descriptions_lower = cats_lower[codes]
+    else:
+        descriptions = desc.astype(str).to_numpy()
+        descriptions_lower = np.array([d.lower() for d in descriptions], dtype=object)
+    amount_index: Dict[float, List[int]] = defaultdict(list)
+    for i, a in enumerate(amounts):
+        amount_index[round(abs(float(a)), 2)].append(i)
+    return {
+        "amounts": amounts,
+        "abs_amounts": np.abs(amounts),
+        "dates": pd.to_datetime(bank_df["date"]).to_numpy().astype("datetime64[D]"),
+        "descriptions": descriptions,
+        "descriptions_lower": descriptions_lower,
+        "amount_index": dict(amount_index),
+    }
+
+
+def _date_window(
+    dates: np.ndarray, inv_date: Optional[Any], max_days_delta: int
+) -> tuple:
+    """Returns the [lo, hi) slice of date-sorted rows inside the match window.
+
+    Operates only on the contiguous date array; missing invoice dates keep the
+    full range (dates are not penalized).
+    """
+    if inv_date is None:
+        return 0, dates.size
+    day = np.datetime64(inv_date)
+    lo = int(np.searchsorted(dates, day, side="left"))
+    last = day + np.timedelta64(max_days_delta, "D")
+    hi = int(np.searchsorted(dates, last, side="right"))
+    return lo, hi
+
+
+def _candidate_indices(
+    abs_amounts: np.ndarray,
+    inv_total: float,
+    amount_tolerance: float,
+    lo: int,
+    hi: int,
+) -> np.ndarray:
+    """Returns indices of window rows whose amount is within tolerance.
 
+    Pure structure-of-arrays filter: one vectorized compare over the
+    contiguous amount array, no per-row Python objects.
+    """
+    window = abs_amounts[lo:hi]
+    return np.flatnonzero(np.abs(window - abs(inv_total)) <= amount_tolerance) + lo
+
+
+def _match_result(
+    bank_columns: Dict[str, Any], idx: int, score: float
+) -> Dict[str, Any]:
+    return {
+        "match_score": score,
+        "bank_date": bank_columns["dates"][idx].item().isoformat(),
+        "bank_amount": bank_columns["amounts"][idx],
+        "bank_description": bank_columns["descriptions"][idx],
+    }
+
+
+def _exact_hit_match(
+    bank_columns: Dict[str, Any],
+    inv_total: float,
+    inv_num_lc: Optional[str],
+    lo: int,
+    hi: int,
+) -> Optional[Dict[str, Any]]:
+    """Exact-amount fast path: O(1) probe of the rounded-amount index.
 
-def _calculate_match_score(
-    invoice_number: Optional[str],
-    transaction_description: str,
-    amount_matches_exactly: bool,
-) -> float:
-    """Calculates a match score based on textual similarity and amount match."""
-    score = 0.0
-    if invoice_number:
-        score = max(
-            fuzz.partial_ratio(invoice_number.lower(), transaction_description.lower()),
-            fuzz.partial_ratio(transaction_description.lower(), invoice_number.lower()),
+    A unique date-valid hit short-circuits the tolerance scan when no other
+    candidate could outscore it (no invoice number, or a perfect fuzzy hit).
+    """
+    exact_hits = bank_columns["amount_index"].get(round(abs(inv_total), 2), [])
+    exact_hits = [i for i in exact_hits if lo <= i < hi]
+    if len(exact_hits) != 1:
+        return None
+    idx = exact_hits[0]
+    if inv_num_lc is None:
+        return _match_result(bank_columns, idx, 5.0)
+    # Only a perfect hit is usable here, so let rapidfuzz bail out early
+    fuzzy = float(
+        fuzz.partial_ratio(
+            inv_num_lc, bank_columns["descriptions_lower"][idx], score_cutoff=100
         )
-    # Slight boost for exact amount match
-    if amount_matches_exactly:
-        score += 5
-    return score
+    )
+    if fuzzy >= 100.0:
+        return _match_result(bank_columns, idx, fuzzy + 5.0)
+    return None
 
 
 def find_best_match(
@@ -350,12 +557,18 @@ def find_best_match(
     bank_df: pd.DataFrame,
     amount_tolerance: float,
     max_days_delta: int,
+    bank_columns: Optional[Dict[str, Any]] = None,
 ) -> Optional[Dict[str, Any]]:
     """Finds the best matching bank transaction for a single invoice."""
     inv_num = invoice.get("invoice_number")
     inv_total = invoice.get("total_amount")
     inv_date_s = invoice.get("invoice_date")
 
+    if inv_total is None:
+        return None
+
+    inv_num_lc = inv_num.lower() if inv_num else None
+
     inv_date = None
     if inv_date_s:
         try:
@@ -363,33 +576,47 @@ def find_best_match(
         except Exception:
             pass
 
-    best_score = -1.0
-    best_row = None
+    if bank_columns is None:
+        bank_columns = _prepare_bank_columns(bank_df)
 
-    for _, row in bank_df.iterrows():
-        if not _check_amount_match(inv_total, row["amount"], amount_tolerance):
-            continue
+    # Candidate filter: slice the date-sorted rows to [invoice date,
+    # invoice date + max_days_delta] via binary search, then mask amounts
+    # within tolerance — both run on the precomputed column arrays.
+    lo, hi = _date_window(bank_columns["dates"], inv_date, max_days_delta)
+    if lo >= hi:
+        return None
 
-        if not _check_date_match(inv_date, row["date"].date(), max_days_delta):
-            continue
+    hit = _exact_hit_match(bank_columns, inv_total, inv_num_lc, lo, hi)
+    if hit is not None:
+        return hit
 
-        amount_matches_exactly = abs(abs(row["amount"]) - abs(inv_total or 0)) <= 1e-9
-        score = _calculate_match_score(
-            inv_num, str(row["description"]), amount_matches_exactly
-        )
+    candidates = _candidate_indices(
+        bank_columns["abs_amounts"], inv_total, amount_tolerance, lo, hi
+    )
+    if candidates.size == 0:
+        return None
 
-        if score > best_score:
-            best_score = score
-            best_row = row
+    # Batched fuzzy scoring: one C++-side cdist call over all candidates
+    # instead of a partial_ratio call per row.
+    scores = np.zeros(candidates.size, dtype=np.float64)
+    if inv_num_lc:
+        # score_cutoff lets the Levenshtein kernel exit early on hopeless
+        # pairs; sub-cutoff scores come back as 0, which is noise anyway.
+        scores = process.cdist(
+            [inv_num_lc],
+            bank_columns["descriptions_lower"][candidates],
+            scorer=fuzz.partial_ratio,
+            score_cutoff=50,
+            workers=-1,
+        )[0].astype(np.float64)
+    # Slight boost for exact amount match
+    exact = np.abs(bank_columns["abs_amounts"][candidates] - abs(inv_total)) <= 1e-9
+    scores[exact] += 5.0
 
-    if best_row is not None:
-        return {
-            "match_score": best_score,
-            "bank_date": best_row["date"].date().isoformat(),
-            "bank_amount": best_row["amount"],
-            "bank_description": best_row["description"],
-        }
-    return None
+    best_pos = int(np.argmax(scores))
+    return _match_result(
+        bank_columns, int(candidates[best_pos]), float(scores[best_pos])
+    )
 
 
 def match_invoices_to_bank(
@@ -399,10 +626,12 @@ def match_invoices_to_bank(
     max_days_delta: int = 90,
 ) -> pd.DataFrame:
     """Matches a list of invoices against a bank statement DataFrame."""
+    bank_columns = _prepare_bank_columns(bank_df)
+
     rows = []
     for inv in invoices:
         match_result = find_best_match(
-            inv, bank_df, amount_tolerance, max_days_delta
+            inv, bank_df, amount_tolerance, max_days_delta, bank_columns=bank_columns
         )
 
         row = {
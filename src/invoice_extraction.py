@@ -1,15 +1,39 @@
 import io
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from typing import Any, Dict, List, Optional
 
 import pdfplumber
 
 from .llm_extraction import extract_with_llm
-from .utils import parse_amount, parse_date, safe_lower
+from .utils import parse_amount, parse_date
+
+try:  # Optional fast PDF text backend (C++ PDFium); pdfplumber remains the fallback
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:  # Optional linear-time regex engine; stdlib re remains the fallback
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+
+def _compile(pattern: str, flags: int = 0):
+    """Compiles with the fast engine, falling back to re on unsupported syntax."""
+    try:
+        return _re_engine.compile(pattern, flags)
+    except Exception:
+        return re.compile(pattern, flags)
+
 
 INVOICE_NUMBER_PATTERNS = [
     r"facture\s*(?:n[°o]|no|num(?:éro)?)\s*[:#-]?\s*([A-Za-z0-9\-_/]{3,})",
     r"invoice\s*(?:n[°o]|no|#)?\s*[:#-]?\s*([A-Za-z0-9\-_/]{3,})",
+    # Catch-all: any "facture <token>"; weaker than the labeled forms above
     r"\b(?:facture|invoice)\s*[:#-]?\s*([A-Za-z0-9\-_/]{3,})",
 ]
 
@@ -22,40 +46,85 @@ TOTAL_PATTERNS = [
     r"montant\s*(?:ttc|total)\s*[:#-]?\s*([+-]?\s*[0-9\s\.,]+)",
 ]
 
-CURRENCY_MARKERS = ["eur", "€", "eur.", "euro", "euros"]
+# Compiled once at import; heuristic_parse runs these per invoice. The
+# number patterns stay separate because their order encodes priority — the
+# catch-all third pattern must not win just by matching earlier in the text.
+# The total patterns are fused into one alternation: both are labeled and
+# equally trustworthy, so a single scan covers all variants.
+_INVOICE_NUMBER_RES = [
+    _compile(p, re.IGNORECASE) for p in INVOICE_NUMBER_PATTERNS
+]
+_DATE_HINT_RES = [_compile(p, re.IGNORECASE) for p in DATE_HINTS]
+_TOTAL_RE = _compile("|".join(f"(?:{p})" for p in TOTAL_PATTERNS), re.IGNORECASE)
+_FALLBACK_DATE_RE = _compile(
+    r"(\d{1,2}[-/. ]\d{1,2}[-/. ]\d{2,4}|\d{4}[-/. ]\d{1,2}[-/. ]\d{1,2})"
+)
+_FALLBACK_AMOUNT_RE = _compile(r"[+-]?\s*[\d\s.,]{2,}")
+# One pass for every euro marker ("eur", "eur.", "euro(s)", "€")
+_CURRENCY_RE = _compile(r"€|eur", re.IGNORECASE)
+
+
+def _page_texts_iter(file_bytes: bytes):
+    """Yields page texts lazily through the available backend."""
+    if pdfium is not None:
+        # PDFium takes raw bytes directly; no BytesIO buffering layer needed
+        doc = pdfium.PdfDocument(file_bytes)
+        try:
+            for page in doc:
+                yield page.get_textpage().get_text_range()
+        finally:
+            doc.close()
+    else:
+        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text(x_tolerance=2, y_tolerance=2) or ""
 
 
+@lru_cache(maxsize=32)
 def extract_text_from_pdf(file_bytes: bytes) -> str:
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        texts = []
-        for page in pdf.pages:
-            txt = page.extract_text(x_tolerance=2, y_tolerance=2) or ""
-            texts.append(txt)
-    return "\n".join(texts)
-
-
-def _find_invoice_number(low_text: str) -> Optional[str]:
-    """Finds the invoice number using a list of regex patterns."""
-    for pat in INVOICE_NUMBER_PATTERNS:
-        m = re.search(pat, low_text, flags=re.IGNORECASE)
+    # Memoized on the raw bytes: re-uploads and re-clicks of the same PDF
+    # skip the parse. The returned str is immutable, so sharing is safe.
+    return "\n".join(_page_texts_iter(file_bytes))
+
+
+def _search_number_patterns(text: str, patterns) -> Optional[str]:
+    """Tries number patterns in priority order on the given text."""
+    for pat in patterns:
+        m = pat.search(text)
         if m:
             return m.group(1).strip().strip(":#-/ ")
     return None
 
 
-def _find_invoice_date(low_text: str) -> Optional[str]:
-    """Finds the invoice date using regex hints and a fallback."""
-    for pat in DATE_HINTS:
-        m = re.search(pat, low_text, flags=re.IGNORECASE)
+def _find_labeled_number(text: str) -> Optional[str]:
+    """Finds a number introduced by an explicit facture/invoice label."""
+    return _search_number_patterns(text, _INVOICE_NUMBER_RES[:-1])
+
+
+def _find_fallback_number(text: str) -> Optional[str]:
+    """Finds a number via the loose catch-all pattern."""
+    return _search_number_patterns(text, _INVOICE_NUMBER_RES[-1:])
+
+
+def _find_invoice_number(text: str) -> Optional[str]:
+    """Finds the invoice number, trying patterns in priority order."""
+    return _search_number_patterns(text, _INVOICE_NUMBER_RES)
+
+
+def _find_hinted_date(text: str) -> Optional[str]:
+    """Finds a date introduced by an explicit date label."""
+    for pat in _DATE_HINT_RES:
+        m = pat.search(text)
         if m:
             dt = parse_date(m.group(1))
             if dt:
                 return dt.date().isoformat()
-    # Fallback: first date-looking token found
-    m = re.search(
-        r"(\d{1,2}[-/. ]\d{1,2}[-/. ]\d{2,4}|\d{4}[-/. ]\d{1,2}[-/. ]\d{1,2})",
-        low_text,
-    )
+    return None
+
+
+def _find_fallback_date(text: str) -> Optional[str]:
+    """Finds the first date-looking token, for texts without a date label."""
+    m = _FALLBACK_DATE_RE.search(text)
     if m:
         dt = parse_date(m.group(1))
         if dt:
@@ -63,64 +132,178 @@ def _find_invoice_date(low_text: str) -> Optional[str]:
     return None
 
 
-def _find_total_amount(low_text: str) -> Optional[float]:
-    """Finds the total amount using regex patterns and a fallback."""
-    for pat in TOTAL_PATTERNS:
-        m = re.search(pat, low_text, flags=re.IGNORECASE)
-        if m:
-            amt = parse_amount(m.group(1))
-            if amt is not None:
-                return amt
-    # Fallback: last amount-looking number could be total
-    amounts = re.findall(r"[+-]?\s*[\d\s.,]{2,}", low_text)
-    candidates = [parse_amount(a) for a in amounts]
-    candidates = [c for c in candidates if c is not None]
-    if candidates:
-        return max(candidates)
-    return None
+def _find_invoice_date(text: str) -> Optional[str]:
+    """Finds the invoice date using regex hints and a fallback."""
+    return _find_hinted_date(text) or _find_fallback_date(text)
 
 
-def _find_currency(low_text: str) -> Optional[str]:
-    """Finds the currency using a list of markers."""
-    for marker in CURRENCY_MARKERS:
-        if marker in low_text:
-            return "EUR"
+def _find_labeled_total(text: str) -> Optional[float]:
+    """Finds an amount introduced by an explicit total/montant label."""
+    for m in _TOTAL_RE.finditer(text):
+        amt = parse_amount(next(g for g in m.groups() if g is not None))
+        if amt is not None:
+            return amt
     return None
 
 
+def _find_fallback_amount(text: str) -> Optional[float]:
+    """Finds the largest amount-looking number, which could be the total.
+
+    The max is folded in one finditer pass without materializing
+    candidate lists.
+    """
+    best = None
+    for m in _FALLBACK_AMOUNT_RE.finditer(text):
+        v = parse_amount(m.group())
+        if v is not None and (best is None or v > best):
+            best = v
+    return best
+
+
+def _find_total_amount(text: str) -> Optional[float]:
+    """Finds the total amount using regex patterns and a fallback."""
+    total = _find_labeled_total(text)
+    if total is not None:
+        return total
+    return _find_fallback_amount(text)
+
+
+def _find_currency(text: str) -> Optional[str]:
+    """Finds the currency marker in a single scan."""
+    return "EUR" if _CURRENCY_RE.search(text) else None
+
+
 def heuristic_parse(text: str) -> Dict[str, Any]:
     """
     Parses a raw text to extract invoice fields using heuristics.
+
+    The compiled patterns all carry IGNORECASE, so the text is scanned
+    as-is instead of allocating a lowercased copy of the whole document.
     """
-    low_text = safe_lower(text)
+    text = text or ""
 
     return {
-        "invoice_number": _find_invoice_number(low_text),
-        "invoice_date": _find_invoice_date(low_text),
-        "total_amount": _find_total_amount(low_text),
-        "currency": _find_currency(low_text) or "EUR",  # default
+        "invoice_number": _find_invoice_number(text),
+        "invoice_date": _find_invoice_date(text),
+        "total_amount": _find_total_amount(text),
+        "currency": _find_currency(text) or "EUR",  # default
     }
 
 
-def extract_invoices_from_pdfs(
-    files, use_llm: bool = False, llm_model: str = "mistral"
-) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    for f in files:
-        content = f.read()
-        text = extract_text_from_pdf(content)
+# LLM calls are IO-bound; a few in flight keeps Ollama busy without flooding it
+_LLM_MAX_WORKERS = 4
 
+# Fields the LLM pass is expected to fill in
+_LLM_FIELDS = ("invoice_number", "invoice_date", "total_amount")
+
+
+def extract_invoice_streaming(file_bytes: bytes) -> Dict[str, Any]:
+    """Parses invoice fields page by page, stopping as soon as all resolve.
+
+    Typical invoices carry every field on the header page, so later pages
+    are never laid out or scanned. Only labeled hits latch during the loop:
+    the weak fallbacks (first date token, largest number) would otherwise
+    fire on page 1 and mask a labeled "Total TTC" on the last page, where
+    totals conventionally sit. "raw_text" holds the pages actually read
+    (the whole document whenever a field stayed missing to the end).
+    """
+    number = date = total = currency = None
+    pages_read = []
+    for page_text in _page_texts_iter(file_bytes):
+        pages_read.append(page_text)
+        if number is None:
+            number = _find_labeled_number(page_text)
+        if date is None:
+            date = _find_hinted_date(page_text)
+        if total is None:
+            total = _find_labeled_total(page_text)
+        if currency is None:
+            currency = _find_currency(page_text)
+        if number and date and total is not None and currency:
+            break
+    else:
+        # The labeled patterns never fully resolved; run the fallbacks once
+        # over everything read, as the whole-document parse would
+        full_text = "\n".join(pages_read)
+        if number is None:
+            number = _find_fallback_number(full_text)
+        if date is None:
+            date = _find_fallback_date(full_text)
+        if total is None:
+            total = _find_fallback_amount(full_text)
+
+    return {
+        "invoice_number": number,
+        "invoice_date": date,
+        "total_amount": total,
+        "currency": currency or "EUR",  # default
+        "raw_text": "\n".join(pages_read),
+    }
+
+
+def _process_one(content: bytes, name: str, full_text: bool = False) -> Dict[str, Any]:
+    """Text extraction plus heuristics for one PDF; the process-pool work unit."""
+    if full_text:
+        # Caller wants the complete document text: parse everything
+        text = extract_text_from_pdf(content)
         parsed = heuristic_parse(text)
-        if use_llm:
-            try:
-                enriched = extract_with_llm(text, model=llm_model)
-                # overlay LLM fields if present
-                parsed.update({k: v for k, v in enriched.items() if v})
-            except Exception:
-                # ignore LLM failures
-                pass
-
-        parsed["filename"] = getattr(f, "name", "facture.pdf")
         parsed["raw_text"] = text
-        results.append(parsed)
+    else:
+        parsed = extract_invoice_streaming(content)
+    parsed["filename"] = name
+    return parsed
+
+
+def _overlay_llm_fields(results: List[Dict[str, Any]], llm_model: str) -> None:
+    """Enriches results in place with concurrent LLM calls over a shared session.
+
+    Invoices whose fields were all filled by the heuristics are skipped — the
+    LLM costs seconds per call and has nothing left to add there.
+    """
+    pending = [p for p in results if any(not p.get(k) for k in _LLM_FIELDS)]
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=_LLM_MAX_WORKERS) as ex:
+        futures = [
+            ex.submit(extract_with_llm, parsed["raw_text"], llm_model)
+            for parsed in pending
+        ]
+    for parsed, fut in zip(pending, futures):
+        try:
+            enriched = fut.result()
+            # overlay LLM fields if present
+            parsed.update({k: v for k, v in enriched.items() if v})
+        except Exception:
+            # ignore LLM failures
+            pass
+
+
+def extract_invoices_from_pdfs(
+    files,
+    use_llm: bool = False,
+    llm_model: str = "mistral",
+    keep_raw_text: bool = False,
+) -> List[Dict[str, Any]]:
+    # Read up front: Streamlit file handles aren't picklable across processes
+    contents = [f.read() for f in files]
+    names = [getattr(f, "name", "facture.pdf") for f in files]
+
+    if len(contents) > 1:
+        workers = min(os.cpu_count() or 1, len(contents))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(
+                ex.map(_process_one, contents, names, repeat(keep_raw_text))
+            )
+    else:
+        results = [
+            _process_one(c, n, keep_raw_text) for c, n in zip(contents, names)
+        ]
+
+    if use_llm and results:
+        _overlay_llm_fields(results, llm_model)
+
+    # Full PDF texts balloon session memory; only keep them on request
+    if not keep_raw_text:
+        for parsed in results:
+            parsed.pop("raw_text", None)
     return results
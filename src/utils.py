@@ -1,42 +1,67 @@
-import re
 from datetime import datetime
 from typing import Optional
 
 from dateutil import parser as dateparser
 
-AMOUNT_RE = re.compile(r"([+-]?)\s*(\d{1,3}(?:[\.,]\d{3})*|\d+)([\.,](\d{2}))?")
+_SPACE_TRANS = str.maketrans({"\u202f": None, "\xa0": None, " ": None})
+
+# Formats seen on FR invoices/statements, tried before the slow fuzzy parser
+_DATE_FORMATS = [
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%d %b %Y",
+    "%d %B %Y",
+]
 
 
 def parse_date(text: str) -> Optional[datetime]:
+    t = (text or "").strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(t, fmt)
+        except ValueError:
+            pass
     try:
         # favor day-first formats typical in FR invoices
-        return dateparser.parse(text, dayfirst=True, fuzzy=True)
+        return dateparser.parse(t, dayfirst=True, fuzzy=True)
     except Exception:
         return None
 
 
 def parse_amount(text: str) -> Optional[float]:
     # Normalize typical FR formats: "1 234,56" or "1.234,56"
-    t = text.replace("\u202f", " ").replace("\xa0", " ").strip()
-    # Replace spaces in numbers
-    t = re.sub(r"(?<=\d)\s+(?=\d)", "", t)
+    t = (text or "").translate(_SPACE_TRANS)
+
+    # Locate the first digit run (separators included)
+    start = None
+    for i, ch in enumerate(t):
+        if ch.isdigit():
+            start = i
+            break
+    if start is None:
+        return None
+    end = start
+    while end < len(t) and (t[end].isdigit() or t[end] in ".,"):
+        end += 1
+    run = t[start:end].rstrip(".,")
 
-    m = AMOUNT_RE.search(t)
-    if not m:
+    # The last "." or "," followed by one or two digits is the decimal
+    # separator; all other separators are thousands marks and dropped
+    sep_pos = max(run.rfind("."), run.rfind(","))
+    int_part, dec_part = run, ""
+    if sep_pos != -1 and 1 <= len(run) - sep_pos - 1 <= 2:
+        int_part, dec_part = run[:sep_pos], run[sep_pos + 1 :]
+    digits = int_part.replace(".", "").replace(",", "")
+    if not digits and not dec_part:
         return None
-    sign, intpart, _, dec = m.groups()
-    intpart = intpart.replace(".", "").replace(",", "")
-    value = float(intpart)
-    if dec is not None:
-        value += float(dec) / 100.0
-    if "," in m.group(0) and "." in m.group(0):
-        # If both separators present, assume "." is thousands sep, "," is decimal
-        pass
+
+    value = float(digits or "0")
+    if dec_part:
+        value += float(dec_part) / (10 ** len(dec_part))
     # Apply sign
-    if sign == "-":
+    if start > 0 and t[start - 1] == "-":
         value = -value
     return value
-
-
-def safe_lower(s: str) -> str:
-    return (s or "").lower()
@@ -1,32 +1,31 @@
-import xml.etree.ElementTree as ET
 from typing import Any, Dict, List
+from xml.sax.saxutils import escape
 
 
 def invoices_to_xml_string(invoices: List[Dict[str, Any]]) -> str:
-    root = ET.Element("invoices")
-    for inv in invoices:
-        e = ET.SubElement(root, "invoice")
-        ET.SubElement(e, "filename").text = str(inv.get("filename") or "")
-        ET.SubElement(e, "invoice_number").text = str(inv.get("invoice_number") or "")
-        ET.SubElement(e, "invoice_date").text = str(inv.get("invoice_date") or "")
-        ET.SubElement(e, "total_amount").text = (
-            "" if inv.get("total_amount") is None else f"{inv.get('total_amount'):.2f}"
-        )
-        ET.SubElement(e, "currency").text = str(inv.get("currency") or "")
-
-    # pretty print
-    _indent(root)
-    return ET.tostring(root, encoding="unicode")
+    """Serializes invoices to pretty-printed XML.
 
+    The structure is fixed and flat (one <invoice> with five leaf tags per
+    row), so the string is built directly instead of going through an
+    ElementTree object graph plus a pretty-printing traversal.
+    """
+    if not invoices:
+        return "<invoices />"
 
-def _indent(elem, level: int = 0):
-    i = "\n" + level * "  "
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = i + "  "
-        for child in elem:
-            _indent(child, level + 1)
-        if not child.tail or not child.tail.strip():
-            child.tail = i
-    if level and (not elem.tail or not elem.tail.strip()):
-        elem.tail = i
+    parts = ["<invoices>"]
+    for inv in invoices:
+        total = inv.get("total_amount")
+        parts.append(
+            "  <invoice>\n"
+            f"    <filename>{escape(str(inv.get('filename') or ''))}</filename>\n"
+            "    <invoice_number>"
+            f"{escape(str(inv.get('invoice_number') or ''))}</invoice_number>\n"
+            "    <invoice_date>"
+            f"{escape(str(inv.get('invoice_date') or ''))}</invoice_date>\n"
+            "    <total_amount>"
+            f"{'' if total is None else f'{total:.2f}'}</total_amount>\n"
+            f"    <currency>{escape(str(inv.get('currency') or ''))}</currency>\n"
+            "  </invoice>"
+        )
+    parts.append("</invoices>")
+    return "\n".join(parts)
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+from rapidfuzz import fuzz
+
+from src.bank_matching import (
+    _find_statement_columns,
+    _parse_text_lines,
+    find_best_match,
+    match_invoices_to_bank,
+)
+
+
+def _bank_df():
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2023-01-05", "2023-01-20", "2023-03-01"]),
+            "description": ["VIR FACT-001", "PRLV EDF", "VIR FACT-002"],
+            "amount": [-120.0, -45.5, -300.0],
+        }
+    )
+
+
+def test_parse_text_lines_accepts_crlf_line_endings():
+    # The PDFium backend emits \r\n; every line must still match
+    text = "01/01/2023 VIR FACT-001 120,00\r\n02/01/2023 PRLV EDF 45,50\r\n"
+    df = _parse_text_lines(text)
+    assert df is not None
+    assert len(df) == 2
+    assert list(df["description"]) == ["VIR FACT-001", "PRLV EDF"]
+    assert list(df["amount"]) == [120.0, 45.5]
+
+
+def test_statement_columns_prefer_amount_over_balance():
+    # Solde is the running balance; Montant/Debit must win regardless of
+    # column order
+    df = pd.DataFrame(columns=["Date", "Libelle", "Solde", "Montant"])
+    assert _find_statement_columns(df)["amount"] == "Montant"
+    df = pd.DataFrame(columns=["Date", "Libelle", "Debit", "Credit", "Solde"])
+    assert _find_statement_columns(df)["amount"] == "Debit"
+
+
+def test_find_best_match_exact_amount_and_number():
+    invoice = {
+        "invoice_number": "FACT-001",
+        "invoice_date": "2023-01-01",
+        "total_amount": 120.0,
+    }
+    match = find_best_match(
+        invoice, _bank_df(), amount_tolerance=0.02, max_days_delta=90
+    )
+    assert match is not None
+    assert match["bank_description"] == "VIR FACT-001"
+    assert match["bank_date"] == "2023-01-05"
+
+
+def test_find_best_match_respects_date_window():
+    invoice = {
+        "invoice_number": "FACT-002",
+        "invoice_date": "2023-01-01",
+        "total_amount": 300.0,
+    }
+    # Payment on 2023-03-01 is 59 days later: outside a 30-day window
+    assert find_best_match(invoice, _bank_df(), 0.02, max_days_delta=30) is None
+    assert find_best_match(invoice, _bank_df(), 0.02, max_days_delta=90) is not None
+
+
+def test_find_best_match_without_total_amount():
+    invoice = {"invoice_number": "FACT-001", "invoice_date": "2023-01-01"}
+    assert find_best_match(invoice, _bank_df(), 0.02, 90) is None
+
+
+@pytest.mark.parametrize("a,b", [
+    ("fact-001", "vir fact-001"),
+    ("inv/2023/42", "prlv sepa inv/2023/42 societe"),
+    ("f-123", "virement"),
+    ("", "anything"),
+])
+def test_partial_ratio_is_symmetric(a, b):
+    # find_best_match relies on a single partial_ratio call per pair; this
+    # guards the assumption that the symmetric second call was redundant.
+    assert fuzz.partial_ratio(a, b) == fuzz.partial_ratio(b, a)
+
+
+def test_match_invoices_to_bank():
+    invoices = [
+        {
+            "filename": "f1.pdf",
+            "invoice_number": "FACT-001",
+            "invoice_date": "2023-01-01",
+            "total_amount": 120.0,
+        },
+        {
+            "filename": "f2.pdf",
+            "invoice_number": "FACT-999",
+            "invoice_date": "2023-01-01",
+            "total_amount": 9999.0,
+        },
+    ]
+    out = match_invoices_to_bank(invoices, _bank_df())
+    assert list(out["matched"]) == [True, False]
+    assert out.loc[0, "bank_amount"] == -120.0
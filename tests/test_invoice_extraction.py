@@ -0,0 +1,54 @@
+from src import invoice_extraction
+from src.invoice_extraction import extract_invoice_streaming, heuristic_parse
+
+SAMPLE_TEXT = """ACME SARL
+Facture N° FAC-2023-042
+Date de facture : 15/03/2023
+Prestations diverses         820,83
+TVA 20%                      164,17
+Total TTC : 985,00 EUR
+"""
+
+
+def test_heuristic_parse_full_invoice():
+    parsed = heuristic_parse(SAMPLE_TEXT)
+    assert parsed["invoice_number"] == "FAC-2023-042"
+    assert parsed["invoice_date"] == "2023-03-15"
+    assert parsed["total_amount"] == 985.0
+    assert parsed["currency"] == "EUR"
+
+
+def test_heuristic_parse_prefers_labeled_invoice_number():
+    # The loose "facture <word>" catch-all must not beat an explicit
+    # "Facture N°" appearing later in the text
+    text = "Facture adressée à Client SA\nFacture N° FAC-001\nTotal : 10,00 EUR"
+    assert heuristic_parse(text)["invoice_number"] == "FAC-001"
+
+
+def test_heuristic_parse_fallbacks():
+    parsed = heuristic_parse("Reçu du 01/02/2023 montant inconnu")
+    assert parsed["invoice_number"] is None
+    assert parsed["invoice_date"] == "2023-02-01"
+    assert parsed["currency"] == "EUR"  # default
+
+
+def test_streaming_waits_for_labeled_total_on_later_page(monkeypatch):
+    pages = [
+        "Page de garde facture client\n"
+        "Date de facture : 15/03/2023\nPrestation 820,83",
+        "Report 164,17\nInvoice no INV-77\nTotal TTC : 1525,00 EUR",
+    ]
+    monkeypatch.setattr(invoice_extraction, "_page_texts_iter", lambda b: iter(pages))
+    parsed = extract_invoice_streaming(b"%PDF")
+    # Neither the page-1 "largest number" fallback nor the loose
+    # "facture <word>" catch-all may shadow the labeled fields on page 2
+    assert parsed["total_amount"] == 1525.0
+    assert parsed["invoice_number"] == "INV-77"
+    assert parsed["invoice_date"] == "2023-03-15"
+
+
+def test_heuristic_parse_empty_text():
+    parsed = heuristic_parse("")
+    assert parsed["invoice_number"] is None
+    assert parsed["invoice_date"] is None
+    assert parsed["total_amount"] is None
@@ -15,6 +15,7 @@ def test_parse_date(test_input, expected):
     ("1,234.56", 1234.56),
     ("1.234,56", 1234.56),
     ("1 234,56", 1234.56),
+    ("1200,00", 1200.0),
     ("100", 100.0),
     ("-50.25", -50.25),
     ("Not a number", None),
@@ -0,0 +1,32 @@
+import xml.etree.ElementTree as ET
+
+from src.xml_export import invoices_to_xml_string
+
+
+def test_invoices_to_xml_string():
+    invoices = [
+        {
+            "filename": "facture <1>.pdf",
+            "invoice_number": "FAC-001",
+            "invoice_date": "2023-03-15",
+            "total_amount": 985.0,
+            "currency": "EUR",
+        },
+        {"filename": "facture2.pdf"},
+    ]
+    xml_str = invoices_to_xml_string(invoices)
+
+    root = ET.fromstring(xml_str)
+    assert root.tag == "invoices"
+    assert len(root) == 2
+    first, second = root
+    assert first.find("filename").text == "facture <1>.pdf"
+    assert first.find("invoice_number").text == "FAC-001"
+    assert first.find("total_amount").text == "985.00"
+    assert second.find("total_amount").text is None
+
+
+def test_invoices_to_xml_string_empty():
+    root = ET.fromstring(invoices_to_xml_string([]))
+    assert root.tag == "invoices"
+    assert len(root) == 0